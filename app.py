@@ -1,12 +1,3 @@
-# app.py — Padel Showdown (sin base de datos)
-# Autor: Victor + GPT
-# Descripción: App 100% en memoria para crear torneos de pádel (americano competitivo),
-# registrar jugadores o equipos, generar rondas SIN byes (opcional), asignar canchas
-# por ranking, registrar/editar resultados y ver leaderboard.
-# v1.3 cambios: botón "Finalizar torneo" cuando se completan todas las rondas y resultados,
-# vista de podio, conteo de rondas totales/generadas/restantes, fix del nombre por defecto
-# incrementando Team # al agregar equipo (reseteo de widgets), y mejoras UX de bloqueo al finalizar.
-
 # ============================================================
 #  🎾 Padel Showdown — v1.5.7
 # Autor: Victor + GPT
@@ -16,12 +7,11 @@
 # registrar resultados, ver leaderboard y finalizar torneo.
 # ============================================================
 
-
-
 from __future__ import annotations
-import json, random
-from dataclasses import dataclass, field, asdict
+import functools, io, json, random, zipfile
+from dataclasses import dataclass, field
 from typing import List, Optional, Tuple, Dict, Any
+import numpy as np
 import pandas as pd
 import streamlit as st
 import re
@@ -29,31 +19,118 @@ import re
 st.set_page_config(page_title="Padel Showdown — sin BD", page_icon="🎾", layout="wide")
 
 POINTS_WIN, POINTS_DRAW = 3, 1
+_CANCHAS_RE = re.compile(r"[,.;\s]+")  # separadores admitidos en el input de canchas
+
+@functools.lru_cache(maxsize=32)
+def _total_rondas(n: int, modo: str) -> int:
+    if modo == "Individual":
+        # Máximo teórico de rondas sin repetir compañero: n - 1 (para n par >= 4)
+        return max(n - 1, 0) if n >= 4 and n % 2 == 0 else 0
+    # Round-robin entre equipos (1 vs 1): n - 1
+    return max(n - 1, 0)
 
 # ==============================
 # 🧱 Modelos
 # ==============================
-@dataclass
+@dataclass(slots=True)
 class Competidor:
     nombre: str
     miembros: Optional[Tuple[str, str]] = None
     puntos: int = 0; pg: int = 0; pe: int = 0; pp: int = 0; dif: int = 0; pj: int = 0
-    def to_dict(self): return asdict(self)
+    display: str = ""
+    def __post_init__(self):
+        # Etiqueta formateada una sola vez; el leaderboard la lee como atributo.
+        if not self.display:
+            self.display = self.nombre if not self.miembros \
+                else f"{self.nombre} ({self.miembros[0]} / {self.miembros[1]})"
+    def to_dict(self):
+        # Literal en vez de asdict(): evita el deepcopy por campo en la
+        # serialización (JSON/Excel recorren todos los competidores).
+        return {"nombre": self.nombre, "miembros": self.miembros,
+                "puntos": self.puntos, "pg": self.pg, "pe": self.pe,
+                "pp": self.pp, "dif": self.dif, "pj": self.pj}
     @staticmethod
     def from_dict(d): return Competidor(**d)
 
-@dataclass
+@dataclass(slots=True)
 class Partido:
     comp1: List[str]; comp2: List[str]
     score1: Optional[int] = None; score2: Optional[int] = None
     jugado: bool = False; ronda: int = 1; cancha: Optional[str] = None
-    def to_dict(self): return asdict(self)
+    def to_dict(self):
+        return {"comp1": list(self.comp1), "comp2": list(self.comp2),
+                "score1": self.score1, "score2": self.score2,
+                "jugado": self.jugado, "ronda": self.ronda, "cancha": self.cancha}
     @staticmethod
     def from_dict(d): return Partido(**d)
 
 # ==============================
 # 🧮 Torneo
 # ==============================
+@st.cache_data(max_entries=8, show_spinner=False)
+def _compute_leaderboard(rows: Tuple[Tuple, ...], version: int) -> pd.DataFrame:
+    # Cacheado por snapshot de stats + versión: los reruns que no cambian
+    # resultados (tipear nombres, mover inputs) no reconstruyen el DataFrame.
+    if not rows:
+        return pd.DataFrame(columns=["Equipo","PTS","PG","PE","PP","Dif","PJ"])
+    # Columnas directas (SoA) en vez de lista de dicts: pandas envuelve los
+    # arrays sin inferir esquema, y el orden sale de un lexsort en C.
+    _, equipos, pts, pg, pe, pp, dif, pj = zip(*rows)
+    pts = np.asarray(pts); pg = np.asarray(pg); dif = np.asarray(dif)
+    # Último criterio: nombre, para que los empates totales queden deterministas.
+    orden = np.lexsort((np.asarray(equipos), -pg, -dif, -pts))
+    medals = ("🥇", "🥈", "🥉")
+    equipos_ord = [f"{medals[i] if i < 3 else ''} {equipos[j]}".strip()
+                   for i, j in enumerate(orden)]
+    df = pd.DataFrame({
+        "Equipo": equipos_ord,
+        "PTS": pts[orden], "PG": pg[orden],
+        "PE": np.asarray(pe)[orden], "PP": np.asarray(pp)[orden],
+        "Dif": dif[orden], "PJ": np.asarray(pj)[orden],
+    })
+    df.index = np.arange(1, len(rows) + 1)
+    return df
+
+# Exportaciones cacheadas: el parámetro _t no se hashea (prefijo _); la clave
+# es la identidad del torneo (nombre, modo, plantel) + snapshot de partidos +
+# versión de stats. st.cache_data es global al proceso, así que sin la
+# identidad dos torneos de sesiones distintas con igual historial colisionarían.
+@st.cache_data(max_entries=2, show_spinner=False)
+def _build_excel(_t: "Torneo", torneo_key: Tuple, partidos_records: Tuple[Tuple, ...], version: int) -> bytes:
+    lb = _t.leaderboard_df()
+    partidos = pd.DataFrame(list(partidos_records),
+                            columns=["Ronda","Cancha","Equipo 1","Equipo 2","Score 1","Score 2","Jugado"])
+    buf = io.BytesIO()
+    # constant_memory: xlsxwriter va volcando filas en vez de retener
+    # todo el workbook en RAM (las hojas se escriben fila a fila, en orden).
+    with pd.ExcelWriter(buf, engine="xlsxwriter",
+                        engine_kwargs={"options": {"constant_memory": True}}) as writer:
+        lb.to_excel(writer, sheet_name="Leaderboard")
+        partidos.to_excel(writer, sheet_name="Partidos", index=False)
+    return buf.getvalue()
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def _build_csv_zip(_t: "Torneo", torneo_key: Tuple, partidos_records: Tuple[Tuple, ...], version: int) -> bytes:
+    # Alternativa liviana al workbook: dos CSV comprimidos, sin serializar XML.
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("leaderboard.csv", _t.leaderboard_df().to_csv(index_label="Pos"))
+        partidos = pd.DataFrame(list(partidos_records),
+                                columns=["Ronda","Cancha","Equipo 1","Equipo 2","Score 1","Score 2","Jugado"])
+        zf.writestr("partidos.csv", partidos.to_csv(index=False))
+    return buf.getvalue()
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _competidores_df(roster: Tuple[Tuple[str, Optional[Tuple[str, str]]], ...]) -> pd.DataFrame:
+    df = pd.DataFrame({"Competidor": [n for n, _ in roster]})
+    if any(m for _, m in roster):  # modo Parejas: mostrar los integrantes
+        df["Miembros"] = [f"{m[0]} / {m[1]}" if m else "" for _, m in roster]
+    return df
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def _build_json(_t: "Torneo", torneo_key: Tuple, partidos_records: Tuple[Tuple, ...], version: int) -> str:
+    return json.dumps(_t.to_dict(), ensure_ascii=False, indent=2)
+
 @dataclass
 class Torneo:
     nombre: str; modo: str
@@ -63,44 +140,107 @@ class Torneo:
     canchas: List[str] = field(default_factory=list)
     permitir_byes: bool = False
     finalizado: bool = False
+    _stats_version: int = 0
+    _rr_schedule: List[List[Tuple[str, str]]] = field(default_factory=list)
+    _rr_key: Optional[Tuple[int, int]] = None
+    _by_round: Dict[int, List[Partido]] = field(default_factory=dict)
+    _unplayed_count: int = 0
+    _lb_cache: Optional[pd.DataFrame] = None
+    _lb_version: int = -1
 
     def reset_all(self):
         for c in self.competidores.values():
             c.puntos = c.pg = c.pe = c.pp = c.dif = c.pj = 0
         self.partidos.clear()
+        self._by_round.clear()
+        self._unplayed_count = 0
         self.ronda_actual = 0
         self.finalizado = False
+        self._stats_version += 1
+        self._rr_key = None  # fuerza un nuevo sorteo del fixture
+
+    def finalizar(self):
+        self.finalizado = True
+        self._stats_version += 1  # invalida exportaciones: el JSON lleva 'finalizado'
 
     def registrar_competidor(self, nombre: str, miembros: Optional[Tuple[str, str]] = None):
         if nombre in self.competidores: raise ValueError("Ya existe ese competidor.")
         self.competidores[nombre] = Competidor(nombre, miembros)
+        self._stats_version += 1  # el alta cambia leaderboard y exportaciones
 
     def lista_comp(self): return list(self.competidores.keys())
 
+    # ====== Exportación ======
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "nombre": self.nombre, "modo": self.modo, "ronda_actual": self.ronda_actual,
+            "canchas": self.canchas, "permitir_byes": self.permitir_byes,
+            "finalizado": self.finalizado,
+            "competidores": [c.to_dict() for c in self.competidores.values()],
+            "partidos": [p.to_dict() for p in self.partidos],
+        }
+
+    def partidos_snapshot(self) -> Tuple[Tuple, ...]:
+        # Snapshot hasheable para las claves de cache de exportación.
+        return tuple((p.ronda, p.cancha, " & ".join(p.comp1), " & ".join(p.comp2),
+                      p.score1, p.score2, p.jugado) for p in self.partidos)
+
+    def export_key(self) -> Tuple:
+        # Identidad del torneo para las claves de cache: distingue torneos
+        # distintos (otras sesiones) con igual historial y contador de versión.
+        return (self.nombre, self.modo,
+                tuple((c.nombre, c.miembros) for c in self.competidores.values()))
+
     # ====== Leaderboard ======
     def leaderboard_df(self):
-        df = pd.DataFrame([{
-            "Nombre": c.nombre,
-            "Equipo": f"{c.nombre}" if not c.miembros else f"{c.nombre} ({c.miembros[0]} / {c.miembros[1]})",
-            "PTS": c.puntos, "PG": c.pg, "PE": c.pe, "PP": c.pp, "Dif": c.dif, "PJ": c.pj
-        } for c in self.competidores.values()])
-        if df.empty: return pd.DataFrame(columns=["Equipo","PTS","PG","PE","PP","Dif","PJ"])
-        df = df.sort_values(by=["PTS","Dif","PG"], ascending=[False,False,False]).reset_index(drop=True)
-        df.index += 1
-        medals = ["🥇" if i==1 else ("🥈" if i==2 else ("🥉" if i==3 else "")) for i in df.index]
-        df["Equipo"] = [f"{m} {n}".strip() for m,n in zip(medals,df["Equipo"])]
-        return df[["Equipo","PTS","PG","PE","PP","Dif","PJ"]]
+        # Cortocircuito por versión: si nada cambió desde el último render se
+        # devuelve el mismo DataFrame, sin snapshot O(N) ni lookup de cache.
+        if self._lb_version == self._stats_version and self._lb_cache is not None:
+            return self._lb_cache
+        rows = tuple(
+            (c.nombre, c.display, c.puntos, c.pg, c.pe, c.pp, c.dif, c.pj)
+            for c in self.competidores.values())
+        self._lb_cache = _compute_leaderboard(rows, self._stats_version)
+        self._lb_version = self._stats_version
+        return self._lb_cache
 
     # ====== Emparejamientos ======
     def total_rondas_posibles(self):
-        n = len(self.competidores)
-        if self.modo == "Individual":
-            # Máximo teórico de rondas sin repetir compañero: n - 1 (para n par >= 4)
-            return max(n - 1, 0) if n >= 4 and n % 2 == 0 else 0
-        else:
-            # Round-robin entre equipos (1 vs 1): n - 1
-            return max(n - 1, 0)
+        return _total_rondas(len(self.competidores), self.modo)
+
+    @property
+    def all_played(self) -> bool:
+        # O(1): contador mantenido por generar_nueva_ronda/registrar_resultado.
+        return self._unplayed_count == 0 and len(self.partidos) > 0
 
+    @staticmethod
+    def _build_circle_schedule(nombres: List[str]) -> List[List[Tuple[str, str]]]:
+        # Método del círculo: fija el primer elemento y rota los demás.
+        # Genera las n-1 rondas de un round-robin completo, sin repeticiones.
+        circulo: List[Optional[str]] = nombres[:]
+        if len(circulo) % 2 != 0:
+            circulo.append(None)  # hueco de bye cuando hay cantidad impar
+        n = len(circulo)
+        fijo, rot = circulo[0], circulo[1:]
+        rondas: List[List[Tuple[str, str]]] = []
+        for _ in range(n - 1):
+            fila = [fijo] + rot
+            pares = [(fila[i], fila[n - 1 - i]) for i in range(n // 2)
+                     if fila[i] is not None and fila[n - 1 - i] is not None]
+            rondas.append(pares)
+            rot = rot[-1:] + rot[:-1]
+        return rondas
+
+    def _schedule_ronda(self, ronda: int) -> List[Tuple[str, str]]:
+        # Fixture calculado una sola vez; se rehace sólo si cambia el plantel.
+        nombres = self.lista_comp()
+        key = (len(nombres), hash(tuple(sorted(nombres))))
+        if key != self._rr_key:
+            sorteo = nombres[:]
+            random.shuffle(sorteo)
+            self._rr_schedule = self._build_circle_schedule(sorteo)
+            self._rr_key = key
+        return self._rr_schedule[(ronda - 1) % len(self._rr_schedule)]
 
     def generar_nueva_ronda(self):
         if self.finalizado:
@@ -122,30 +262,18 @@ class Torneo:
         # MODO INDIVIDUAL (2v2)
         # =========================
         if self.modo == "Individual":
-            # 🔹 1️⃣ RONDA INICIAL → aleatoria total
-            if self.ronda_actual == 1:
-                orden = nombres[:]
-                random.shuffle(orden)
-            # 🔹 2️⃣ RONDAS POSTERIORES → según ranking (PTS, DIF, PG)
-            else:
-                lb = self.leaderboard_df()
-                if lb.empty:
-                    orden = nombres[:]
-                else:
-                    orden = []
-                    for fila in lb["Equipo"].tolist():
-                        tokens = fila.strip().split(" ")
-                        orden.append(tokens[-1])
-                    orden = [n for n in orden if n in self.competidores] + [n for n in nombres if n not in orden]
-
-            # Verifica paridad (para formar duplas)
-            if len(orden) % 2 != 0:
-                if not self.permitir_byes:
-                    raise ValueError("Número impar de jugadores y 'Permitir byes' está desactivado.")
-                orden = orden[:-1]
-
-            # Forma duplas adyacentes por ranking: (1,2), (3,4), ...
-            equipos = [orden[i:i+2] for i in range(0, len(orden), 2)]
+            if len(nombres) % 2 != 0 and not self.permitir_byes:
+                raise ValueError("Número impar de jugadores y 'Permitir byes' está desactivado.")
+
+            # 🔹 Las duplas de la ronda salen del fixture círculo: cada jugador
+            # cambia de compañero ronda a ronda sin repetir en todo el torneo.
+            equipos = [list(par) for par in self._schedule_ronda(ronda)]
+
+            # Duplas ordenadas por fuerza combinada (PTS, DIF, PG) → partidos parejos
+            def _fuerza(dupla):
+                cs = [self.competidores[n] for n in dupla]
+                return (-sum(c.puntos for c in cs), -sum(c.dif for c in cs), -sum(c.pg for c in cs))
+            equipos.sort(key=_fuerza)
 
             # Cada partido requiere 2 duplas → número de partidos
             num_matches = len(equipos) // 2
@@ -166,79 +294,111 @@ class Torneo:
         # MODO PAREJAS (equipo vs equipo)
         # =========================
         else:
-            # Ordena por ranking actual de equipos
-            orden_objs = sorted(self.competidores.values(), key=lambda c: (-c.puntos, -c.dif, -c.pg))
-            order = [c.nombre for c in orden_objs]
-
-            if len(order) % 2 != 0:
-                if not self.permitir_byes:
-                    raise ValueError("Número impar de equipos y 'Permitir byes' está desactivado.")
-                order = order[:-1]
+            if len(nombres) % 2 != 0 and not self.permitir_byes:
+                raise ValueError("Número impar de equipos y 'Permitir byes' está desactivado.")
 
-            num_matches = len(order) // 2
+            # 🔹 Cruces directos del fixture círculo: ningún equipo repite rival.
+            pares = self._schedule_ronda(ronda)
+            num_matches = len(pares)
 
             # 🚫 Evitar canchas duplicadas dentro de la ronda
             if self.canchas and len(self.canchas) < num_matches:
                 raise ValueError(f"Faltan canchas: se requieren {num_matches} canchas y definiste {len(self.canchas)}.")
 
-            for m in range(num_matches):
-                a = order[2*m]; b = order[2*m + 1]
+            for m, (a, b) in enumerate(pares):
                 cancha = self.canchas[m] if (self.canchas and m < len(self.canchas)) else None
                 partidos.append(Partido(comp1=[a], comp2=[b], ronda=ronda, cancha=cancha))
 
         self.partidos.extend(partidos)
+        self._by_round[ronda] = partidos
+        self._unplayed_count += len(partidos)
         return partidos
 
 
     def partidos_de_ronda(self, ronda:int):
-        return [p for p in self.partidos if p.ronda == ronda]
-
-    def registrar_resultado(self, partido:Partido, score1:int, score2:int):
-        partido.score1, partido.score2 = score1, score2
-        partido.jugado = True
-        # Recalcular puntos
-        for c in self.competidores.values():
-            c.puntos=c.pg=c.pe=c.pp=c.dif=c.pj=0
+        return self._by_round.get(ronda, [])
 
+    def _aplicar_partido(self, p:Partido, s1:int, s2:int, signo:int = 1):
+        # Suma (signo=1) o revierte (signo=-1) la contribución de un partido.
+        if self.modo == "Individual":
+            # Resuelve cada nombre a su Competidor una sola vez: el resto del
+            # método trabaja sobre objetos, sin repetir hashes de dict por campo.
+            lado1 = [self.competidores[n] for n in p.comp1 if n in self.competidores]
+            lado2 = [self.competidores[n] for n in p.comp2 if n in self.competidores]
+            for c in lado1 + lado2:
+                c.pj += signo
+            # La diferencia se acredita una sola vez por jugador (el doble loop
+            # anterior la contaba una vez por cada rival).
+            for c in lado1: c.dif += signo * (s1 - s2)
+            for c in lado2: c.dif += signo * (s2 - s1)
+            if s1 > s2:
+                for c in lado1:
+                    c.pg += signo; c.puntos += signo * POINTS_WIN
+                for c in lado2:
+                    c.pp += signo
+            elif s2 > s1:
+                for c in lado2:
+                    c.pg += signo; c.puntos += signo * POINTS_WIN
+                for c in lado1:
+                    c.pp += signo
+            else:
+                for c in lado1 + lado2:
+                    c.pe += signo; c.puntos += signo * POINTS_DRAW
+        else:
+            c1 = self.competidores[p.comp1[0]]; c2 = self.competidores[p.comp2[0]]
+            c1.pj += signo; c2.pj += signo; c1.dif += signo*(s1-s2); c2.dif += signo*(s2-s1)
+            if s1>s2: c1.pg+=signo;c1.puntos+=signo*POINTS_WIN;c2.pp+=signo
+            elif s2>s1: c2.pg+=signo;c2.puntos+=signo*POINTS_WIN;c1.pp+=signo
+            else: c1.pe+=signo;c2.pe+=signo;c1.puntos+=signo*POINTS_DRAW;c2.puntos+=signo*POINTS_DRAW
+
+    def recompute_all_stats(self):
+        # Reconstrucción completa (p. ej. tras cargar un estado externo),
+        # como scatter vectorizado: una entrada (índice, delta) por jugador
+        # involucrado y np.add.at para acumular todo en C.
+        comps = list(self.competidores.values())
+        idx = {c.nombre: i for i, c in enumerate(comps)}
+        ii: List[int] = []; dd: List[int] = []
         for p in self.partidos:
             if not p.jugado: continue
             s1, s2 = int(p.score1), int(p.score2)
-            if self.modo == "Individual":
-                # Sumar a cada jugador de cada pareja
-                for player in p.comp1+p.comp2:
-                    if player not in self.competidores: continue
-                    self.competidores[player].pj += 1
-                for a in p.comp1:
-                    for b in p.comp2:
-                        self.competidores[a].dif += (s1 - s2)
-                        self.competidores[b].dif += (s2 - s1)
-                if s1 > s2:
-                    for a in p.comp1:
-                        self.competidores[a].pg += 1
-                        self.competidores[a].puntos += POINTS_WIN
-                    for b in p.comp2:
-                        self.competidores[b].pp += 1
-                elif s2 > s1:
-                    for b in p.comp2:
-                        self.competidores[b].pg += 1
-                        self.competidores[b].puntos += POINTS_WIN
-                    for a in p.comp1:
-                        self.competidores[a].pp += 1
-                else:
-                    for player in p.comp1+p.comp2:
-                        self.competidores[player].pe += 1
-                        self.competidores[player].puntos += POINTS_DRAW
-            else:
-                c1 = self.competidores[p.comp1[0]]; c2 = self.competidores[p.comp2[0]]
-                c1.pj += 1; c2.pj += 1; c1.dif += s1-s2; c2.dif += s2-s1
-                if s1>s2: c1.pg+=1;c1.puntos+=POINTS_WIN;c2.pp+=1
-                elif s2>s1: c2.pg+=1;c2.puntos+=POINTS_WIN;c1.pp+=1
-                else: c1.pe+=1;c2.pe+=1;c1.puntos+=POINTS_DRAW;c2.puntos+=POINTS_DRAW
+            for nombres, d in ((p.comp1, s1 - s2), (p.comp2, s2 - s1)):
+                for nom in nombres:
+                    if nom in idx:
+                        ii.append(idx[nom]); dd.append(d)
+        n = len(comps)
+        pj = np.zeros(n, dtype=np.int64); dif = np.zeros(n, dtype=np.int64)
+        pg = np.zeros(n, dtype=np.int64); pe = np.zeros(n, dtype=np.int64)
+        pp = np.zeros(n, dtype=np.int64); puntos = np.zeros(n, dtype=np.int64)
+        if ii:
+            ia = np.asarray(ii); da = np.asarray(dd)
+            win = da > 0; draw = da == 0
+            np.add.at(pj, ia, 1)
+            np.add.at(dif, ia, da)
+            np.add.at(pg, ia, win)
+            np.add.at(pe, ia, draw)
+            np.add.at(pp, ia, da < 0)
+            np.add.at(puntos, ia, win * POINTS_WIN + draw * POINTS_DRAW)
+        for i, c in enumerate(comps):
+            c.pj = int(pj[i]); c.dif = int(dif[i]); c.pg = int(pg[i])
+            c.pe = int(pe[i]); c.pp = int(pp[i]); c.puntos = int(puntos[i])
+        self._stats_version += 1
+
+    def registrar_resultado(self, partido:Partido, score1:int, score2:int):
+        # Delta O(1): revierte la contribución anterior del partido (si la hubo)
+        # y aplica la nueva, en vez de re-sumar todos los partidos jugados.
+        if partido.jugado:
+            self._aplicar_partido(partido, int(partido.score1), int(partido.score2), -1)
+        else:
+            self._unplayed_count -= 1
+        partido.score1, partido.score2 = score1, score2
+        partido.jugado = True
+        self._aplicar_partido(partido, int(score1), int(score2))
+        self._stats_version += 1
 
 # ==============================
 # 🖥️ UI
 # ==============================
-if "torneo" not in st.session_state: st.session_state.torneo=None
+st.session_state.setdefault("torneo", None)
 st.title("🎾 Padel Showdown — Torneos sin membresías (100% en memoria)")
 
 # --- Sidebar ---
@@ -247,7 +407,7 @@ with st.sidebar:
     if st.session_state.torneo is None:
         nombre = st.text_input("Nombre del torneo", "Mi Torneo Padel Showdown")
         modo = st.radio("Modo", ["Individual", "Parejas"], horizontal=True)
-        canchas = [c.strip() for c in re.split(r"[,.;\s]+", st.text_input("Canchas", "1,2,3")) if c.strip()]
+        canchas = [c.strip() for c in _CANCHAS_RE.split(st.text_input("Canchas", "1,2,3")) if c.strip()]
         permitir_byes = st.checkbox("Permitir byes (solo Individual)", value=False)
         if st.button("🆕 Crear torneo", use_container_width=True):
             st.session_state.torneo = Torneo(nombre, modo, canchas=canchas, permitir_byes=permitir_byes)
@@ -258,6 +418,25 @@ with st.sidebar:
         st.caption(f"Canchas: {', '.join(t.canchas)} — Finalizado: {'Sí' if t.finalizado else 'No'}")
         if st.button("🗑️ Reiniciar", use_container_width=True):
             t.reset_all(); st.info("Reiniciado."); st.rerun()
+        st.divider()
+        st.subheader("📤 Exportar")
+        snap = t.partidos_snapshot()
+        tkey = t.export_key()
+        # El workbook se materializa recién cuando alguien lo pide: los reruns
+        # de sesiones que nunca exportan no pagan la construcción.
+        if st.button("📦 Preparar Excel", use_container_width=True):
+            st.session_state._excel_listo = True
+        if st.session_state.get("_excel_listo"):
+            st.download_button("⬇️ Excel (.xlsx)", data=_build_excel(t, tkey, snap, t._stats_version),
+                               file_name=f"{t.nombre}.xlsx",
+                               mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                               use_container_width=True)
+        st.download_button("⬇️ CSV (.zip)", data=_build_csv_zip(t, tkey, snap, t._stats_version),
+                           file_name=f"{t.nombre}.zip", mime="application/zip",
+                           use_container_width=True)
+        st.download_button("⬇️ JSON", data=_build_json(t, tkey, snap, t._stats_version),
+                           file_name=f"{t.nombre}.json", mime="application/json",
+                           use_container_width=True)
 
 if st.session_state.torneo is None: st.stop()
 t: Torneo = st.session_state.torneo
@@ -271,7 +450,7 @@ if t.modo == "Individual":
         elif n in t.competidores: st.warning("Ya existe.")
         else: t.registrar_competidor(n.strip()); st.success(f"Jugador {n} agregado."); st.rerun()
 else:
-    if "_team_counter" not in st.session_state: st.session_state._team_counter = len(t.competidores)+1
+    st.session_state.setdefault("_team_counter", len(t.competidores)+1)
     col1, col2 = st.columns(2)
     m1 = col1.text_input("Miembro 1"); m2 = col2.text_input("Miembro 2")
     if st.button("➕ Agregar equipo", use_container_width=True, disabled=t.finalizado):
@@ -283,8 +462,8 @@ else:
             st.session_state._team_counter += 1; st.rerun()
 
 if t.competidores:
-    df = pd.DataFrame({"Competidor": list(t.competidores.keys())})
-    st.dataframe(df, use_container_width=True)
+    roster = tuple((c.nombre, c.miembros) for c in t.competidores.values())
+    st.dataframe(_competidores_df(roster), use_container_width=True)
 else:
     st.info("Agrega competidores para continuar.")
 st.divider()
@@ -303,27 +482,57 @@ if not t.finalizado:
 else:
     st.warning("🏁 Torneo finalizado. No se pueden generar más rondas.")
 
-for r in range(1, t.ronda_actual + 1):
+@st.fragment
+def _render_ronda(t: Torneo, r: int):
+    # Fragmento: editar celdas re-ejecuta sólo esta ronda, no toda la página.
+    # Una sola tabla editable por ronda en vez de 4 widgets por partido.
     ronda = t.partidos_de_ronda(r)
-    with st.expander(f"Ronda {r} — {len(ronda)} partido(s)", expanded=(r == t.ronda_actual)):
+    filas = pd.DataFrame([{
+        "Partido": f"{' & '.join(p.comp1)} vs {' & '.join(p.comp2)}",
+        "Cancha": p.cancha or "",
+        "Score 1": int(p.score1) if p.score1 else 0,
+        "Score 2": int(p.score2) if p.score2 else 0,
+        "Jugado": p.jugado,
+    } for p in ronda])
+    # El form difiere los reruns: editar celdas no dispara nada hasta Guardar.
+    with st.form(f"form_r{r}"):
+        edited = st.data_editor(
+            filas, hide_index=True, use_container_width=True, key=f"ronda_{r}",
+            column_config={
+                "Score 1": st.column_config.NumberColumn(min_value=0, max_value=99, step=1, required=True),
+                "Score 2": st.column_config.NumberColumn(min_value=0, max_value=99, step=1, required=True),
+                "Jugado": st.column_config.CheckboxColumn(
+                    help="Marcar para guardar el resultado de la fila (permite 0-0)"),
+            },
+            disabled=True if t.finalizado else ["Partido", "Cancha"],
+        )
+        submitted = st.form_submit_button("💾 Guardar ronda", disabled=t.finalizado)
+    if submitted:
+        cambios = 0
         for idx, p in enumerate(ronda):
-            cols = st.columns([2.8, 0.8, 0.8, 1])
-            etiqueta = f"{' & '.join(p.comp1)} vs {' & '.join(p.comp2)}"
-            if p.cancha: etiqueta += f" (Cancha {p.cancha})"
-            cols[0].write(f"**{etiqueta}**")
-            s1 = cols[1].number_input(" ", 0, 99, int(p.score1) if p.score1 else 0, key=f"s1_{r}_{idx}", disabled=t.finalizado)
-            s2 = cols[2].number_input(" ", 0, 99, int(p.score2) if p.score2 else 0, key=f"s2_{r}_{idx}", disabled=t.finalizado)
-            if cols[3].button("💾 Guardar", key=f"save_{r}_{idx}", disabled=t.finalizado):
-                t.registrar_resultado(p, s1, s2)
-                cols[3].success("✅ Guardado", icon="💾")
+            fila = edited.iloc[idx]
+            if pd.isna(fila["Score 1"]) or pd.isna(fila["Score 2"]): continue  # celda vaciada
+            # "Jugado" marca qué filas guardar: un 0-0 legítimo se registra
+            # tildándolo. Destildar una fila ya jugada no anula el resultado.
+            if not fila["Jugado"]: continue
+            s1, s2 = int(fila["Score 1"]), int(fila["Score 2"])
+            if p.jugado and int(p.score1) == s1 and int(p.score2) == s2: continue
+            t.registrar_resultado(p, s1, s2)
+            cambios += 1
+        if cambios:
+            st.toast(f"✅ {cambios} resultado(s) guardado(s)", icon="💾")
+            st.rerun(scope="app")
+
+for r in range(1, t.ronda_actual + 1):
+    with st.expander(f"Ronda {r} — {len(t.partidos_de_ronda(r))} partido(s)", expanded=(r == t.ronda_actual)):
+        _render_ronda(t, r)
 
 
 # --- Finalizar torneo ---
-all_played = all(p.jugado for p in t.partidos) and t.partidos
-if not t.finalizado and all_played:
+if not t.finalizado and t.all_played:
     st.success("✅ Todas las rondas completas.")
     if st.button("🏁 Finalizar torneo", use_container_width=True):
-        t.finalizado = True
+        t.finalizar()
         st.toast("🏁 ¡Torneo finalizado!", icon="🏆")
         st.rerun()
 